@@ -4,9 +4,47 @@ Universal agent system for any project
 """
 
 import os
-import json
+import re
+import mmap
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional
+from serialization import dump_file, loads
+
+# Upper bound on memoized metadata entries
+METADATA_CACHE_SIZE = 16 ** 4
+
+# Profiles at least this large are read through mmap
+MMAP_THRESHOLD = 64 * 1024
+
+# On-disk metadata cache, stored inside the profiles directory
+METADATA_CACHE_FILE = '.agent_cache.json'
+
+# Profile header fields, e.g. "- **Role:** Lead Full-Stack Developer"
+_META_RE = re.compile(r'^[ \t]*(?:[-*][ \t]+)?\*\*(Role|Tier|Specialty):\*\*[ \t]*(.+?)[ \t]*$', re.M)
+# First line following the PERSONALITY heading
+_PERSONALITY_RE = re.compile(r'PERSONALITY[^\n]*\n([^\n]*)')
+
+
+def _read_profile(path: str) -> str:
+    """Read a profile as text, mapping large files instead of buffering them"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            content = f.read().decode('utf-8')
+        else:
+            # Decode straight from the mapped pages, skipping an intermediate bytes copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+
+    # Match the universal-newline handling of text-mode reads (\r\n and lone \r)
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _copy_metadata(metadata: Dict) -> Dict:
+    """Copy cached metadata so callers can't modify the cached dict"""
+    return {**metadata, 'collaborates_with': list(metadata.get('collaborates_with') or [])}
 
 
 class AgentLoader:
@@ -16,6 +54,16 @@ class AgentLoader:
         self.profiles_dir = Path(profiles_dir)
         self.agents: Dict = {}
         self.agent_registry: List[Dict] = []
+        self._agent_index: Dict[str, Dict] = {}
+        self._filename_index: Dict[str, Dict] = {}
+        self._phase_index: Dict[str, List[Dict]] = defaultdict(list)
+        self._metadata_cache: Dict[tuple, Dict] = {}
+        self._cache_path = self.profiles_dir / METADATA_CACHE_FILE
+        # On-disk metadata cache entries, read on first get_agent_metadata call
+        self._disk_cache: Optional[Dict[str, Dict]] = None
+        self._cache_dirty = False
+        # Cleared after the first failed write so a read-only dir warns only once
+        self._cache_writable = True
 
     def load_agent(self, agent_filename: str) -> str:
         """
@@ -27,47 +75,168 @@ class AgentLoader:
         Returns:
             Content of the agent profile
         """
-        # Search for agent in all phase directories
-        for phase_dir in ['leadership', 'planning', 'development', 'qa', 'deployment']:
-            agent_path = self.profiles_dir / phase_dir / agent_filename
-            if agent_path.exists():
-                with open(agent_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.agents[agent_filename] = {
-                        'path': str(agent_path),
-                        'phase': phase_dir,
-                        'content': content
-                    }
-                    return content
-
-        raise FileNotFoundError(f"Agent file not found: {agent_filename}")
+        if not self._filename_index:
+            self.register_all_agents()
 
-    def load_all_agents(self) -> Dict[str, str]:
-        """Load all agent profiles"""
-        agents = {}
+        agent = self._filename_index.get(agent_filename)
+        if agent is None:
+            raise FileNotFoundError(f"Agent file not found: {agent_filename}")
+
+        return self._ensure_loaded(agent['id'])
+
+    def register_all_agents(self) -> Dict[str, str]:
+        """
+        Register all agent profiles without reading their contents
+
+        Returns:
+            Dictionary mapping agent IDs to profile paths
+        """
+        registered = {}
+
+        # Start from a clean registry so repeated registration doesn't duplicate entries
+        self.agent_registry = []
+        self._agent_index = {}
+        self._filename_index = {}
+        self._phase_index = defaultdict(list)
 
         for phase_dir in ['leadership', 'planning', 'development', 'qa', 'deployment']:
             phase_path = self.profiles_dir / phase_dir
             if phase_path.exists():
-                for agent_file in phase_path.glob('*.md'):
-                    agent_name = agent_file.stem
-                    try:
-                        content = self.load_agent(agent_file.name)
-                        agents[agent_name] = content
-                        self.agent_registry.append({
+                with os.scandir(phase_path) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.md') or not entry.is_file(follow_symlinks=False):
+                            continue
+                        agent_name = entry.name[:-len('.md')]
+                        agent = {
                             'id': agent_name,
-                            'filename': agent_file.name,
+                            'filename': entry.name,
                             'phase': phase_dir,
-                            'path': str(agent_file)
-                        })
-                    except Exception as e:
-                        print(f"Error loading agent {agent_name}: {e}")
+                            'path': entry.path
+                        }
+                        registered[agent_name] = entry.path
+                        self.agent_registry.append(agent)
+                        self._agent_index[agent_name] = agent
+                        self._filename_index[entry.name] = agent
+                        self._phase_index[phase_dir].append(agent)
+
+        return registered
+
+    def get_agent_metadata(self, agent_id: str) -> Dict:
+        """
+        Get the metadata of a registered agent
+
+        Metadata is served from the on-disk cache while the profile's
+        mtime and size are unchanged; otherwise the profile is re-parsed.
+        Re-parsed entries are saved by flush_metadata_cache().
+        """
+        agent = self._agent_index.get(agent_id)
+        if agent is None:
+            raise ValueError(f"Agent not found: {agent_id}")
+
+        st = os.stat(agent['path'])
+        key = f"{agent['phase']}/{agent['filename']}"
+        if self._disk_cache is None:
+            self._disk_cache = self._read_metadata_cache()
 
-        return agents
+        entry = self._disk_cache.get(key)
+        if (
+            isinstance(entry, dict)
+            and isinstance(entry.get('metadata'), dict)
+            and entry.get('mtime_ns') == st.st_mtime_ns
+            and entry.get('size') == st.st_size
+        ):
+            return _copy_metadata(entry['metadata'])
+
+        # Parse without pinning the profile text in self.agents
+        loaded = self.agents.get(agent['filename'])
+        content = loaded['content'] if loaded is not None else _read_profile(agent['path'])
+        metadata = self.extract_agent_metadata(content)
+
+        self._disk_cache[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'metadata': metadata}
+        self._cache_dirty = True
+
+        return _copy_metadata(metadata)
+
+    def get_all_metadata(self) -> Dict[str, Dict]:
+        """Get metadata for every registered agent, saving the cache once afterwards"""
+        metadata = {agent['id']: self.get_agent_metadata(agent['id']) for agent in self.agent_registry}
+        self.flush_metadata_cache()
+        return metadata
+
+    def flush_metadata_cache(self):
+        """Write the on-disk metadata cache if any entry changed since the last write"""
+        if self._cache_dirty and self._cache_writable:
+            self._write_metadata_cache(self._disk_cache)
+
+    def _read_metadata_cache(self) -> Dict[str, Dict]:
+        """Read the on-disk metadata cache, treating a missing or corrupt file as empty"""
+        try:
+            with open(self._cache_path, 'rb') as f:
+                entries = loads(f.read()).get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write_metadata_cache(self, entries: Dict[str, Dict]):
+        """Atomically replace the on-disk metadata cache"""
+        # Drop entries for profiles that are no longer registered
+        registered = {f"{agent['phase']}/{agent['filename']}" for agent in self.agent_registry}
+        entries = {key: entry for key, entry in entries.items() if key in registered}
+
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        try:
+            dump_file({'entries': entries}, tmp_path)
+            os.replace(tmp_path, self._cache_path)
+            self._cache_dirty = False
+        except OSError as e:
+            # The cache is an optimization; a read-only profiles dir just skips it
+            print(f"Could not write agent metadata cache: {e}")
+            self._cache_writable = False
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def load_all_agents(self) -> Dict[str, str]:
+        """Load all agent profiles"""
+        for agent_name in self.register_all_agents():
+            try:
+                self._ensure_loaded(agent_name)
+            except Exception as e:
+                print(f"Error loading agent {agent_name}: {e}")
+
+        # View over self.agents, which remains the only store of profile contents
+        return {Path(filename).stem: agent['content'] for filename, agent in self.agents.items()}
+
+    def has_agent(self, agent_id: str) -> bool:
+        """Check whether an agent ID has been registered"""
+        return agent_id in self._agent_index
+
+    def get_agent_content(self, agent_id: str) -> str:
+        """Get the profile content of a registered agent, reading it on first use"""
+        return self._ensure_loaded(agent_id)
+
+    def _ensure_loaded(self, agent_id: str) -> str:
+        """Read a registered agent profile on first access and cache it"""
+        agent = self._agent_index.get(agent_id)
+        if agent is None:
+            raise ValueError(f"Agent not found: {agent_id}")
+
+        cached = self.agents.get(agent['filename'])
+        if cached is not None:
+            return cached['content']
+
+        content = _read_profile(agent['path'])
+        self.agents[agent['filename']] = {
+            'path': agent['path'],
+            'phase': agent['phase'],
+            'content': content
+        }
+        return content
 
     def get_agent_by_phase(self, phase: str) -> List[Dict]:
         """Get all agents for a specific phase"""
-        return [agent for agent in self.agent_registry if agent['phase'] == phase]
+        return list(self._phase_index.get(phase, []))
 
     def get_agent_registry(self) -> List[Dict]:
         """Get the full agent registry"""
@@ -80,6 +249,12 @@ class AgentLoader:
         Returns:
             Dictionary with agent metadata
         """
+        # str caches its own hash, so repeat lookups for the same profile are O(1)
+        key = (hash(agent_content), len(agent_content))
+        cached = self._metadata_cache.get(key)
+        if cached is not None:
+            return _copy_metadata(cached)
+
         metadata = {
             'role': None,
             'tier': None,
@@ -88,36 +263,32 @@ class AgentLoader:
             'collaborates_with': []
         }
 
-        lines = agent_content.split('\n')
-        for i, line in enumerate(lines):
-            if 'Role:' in line and '**' in line:
-                metadata['role'] = line.split('**')[-2]
-            elif 'Tier:' in line and '**' in line:
-                metadata['tier'] = line.split('**')[-2]
-            elif 'Specialty:' in line and '**' in line:
-                metadata['specialty'] = line.split('**')[-2]
-            elif 'PERSONALITY' in line:
-                if i + 1 < len(lines):
-                    metadata['personality'] = lines[i + 1].strip()
+        for match in _META_RE.finditer(agent_content):
+            metadata[match.group(1).lower()] = match.group(2).strip('* ')
 
-        return metadata
+        personality = _PERSONALITY_RE.search(agent_content)
+        if personality:
+            metadata['personality'] = personality.group(1).strip()
 
-    def export_registry_json(self, output_file: str = "agent_registry.json"):
-        """Export agent registry as JSON"""
+        if len(self._metadata_cache) >= METADATA_CACHE_SIZE:
+            # Evict the oldest entry
+            del self._metadata_cache[next(iter(self._metadata_cache))]
+        self._metadata_cache[key] = metadata
+
+        return _copy_metadata(metadata)
+
+    def export_registry_json(self, output_file: str = "agent_registry.json", indent: Optional[int] = None):
+        """Export agent registry as JSON (compact unless an indent is given)"""
         registry_data = {
             'agents': self.agent_registry,
             'total_agents': len(self.agent_registry),
             'phases': {
-                'leadership': self.get_agent_by_phase('leadership'),
-                'planning': self.get_agent_by_phase('planning'),
-                'development': self.get_agent_by_phase('development'),
-                'qa': self.get_agent_by_phase('qa'),
-                'deployment': self.get_agent_by_phase('deployment')
+                phase: self._phase_index.get(phase, [])
+                for phase in ['leadership', 'planning', 'development', 'qa', 'deployment']
             }
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(registry_data, f, indent=2)
+        dump_file(registry_data, output_file, indent=indent)
 
         print(f"Agent registry exported to {output_file}")
 
@@ -134,13 +305,21 @@ class AgentLoader:
             'deployment': 'Phase 4: Deployment & Operations'
         }
 
+        # Served from the on-disk cache; profiles are only parsed when it is stale
+        metadata = self.get_all_metadata()
+
         for phase_key, phase_name in phases.items():
             agents = self.get_agent_by_phase(phase_key)
             if agents:
                 print(f"\n{phase_name}")
                 print("-" * 80)
                 for agent in agents:
+                    agent_metadata = metadata.get(agent['id'], {})
                     print(f"  • {agent['id']}")
+                    if agent_metadata.get('role'):
+                        print(f"    Role: {agent_metadata['role']}")
+                    if agent_metadata.get('specialty'):
+                        print(f"    Specialty: {agent_metadata['specialty']}")
                     print(f"    File: {agent['filename']}")
                     print()
 
@@ -149,10 +328,10 @@ if __name__ == "__main__":
     # Example usage
     loader = AgentLoader()
 
-    # Load all agents
-    print("Loading all agents...")
-    agents = loader.load_all_agents()
-    print(f"✅ Loaded {len(agents)} agents\n")
+    # Register all agents (profiles are read on first use)
+    print("Registering all agents...")
+    agents = loader.register_all_agents()
+    print(f"✅ Registered {len(agents)} agents\n")
 
     # Print registry
     loader.print_registry()
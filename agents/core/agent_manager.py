@@ -4,25 +4,66 @@ Universal agent system for any project
 """
 
 import os
+import asyncio
+import importlib.util
 from typing import Dict, List, Optional
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient
 from agent_loader import AgentLoader
 
+# Upper bound on in-flight requests during multi-agent fan-out
+MAX_CONCURRENT_REQUESTS = 16
+# Connection pool size for the async client
+MAX_CONNECTIONS = 32
+
 
 class AgentManager:
     """Manage agents, invoke them, and handle inter-agent communication"""
 
     def __init__(self, profiles_dir: str = "./agents/profiles", api_key: Optional[str] = None):
         self.loader = AgentLoader(profiles_dir)
-        self.agents = {}
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         self.client = Anthropic(api_key=self.api_key) if self.api_key else None
+        self.aclient = AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS
+                ),
+                # HTTP/2 needs the optional h2 package
+                http2=importlib.util.find_spec('h2') is not None
+            )
+        ) if self.api_key else None
         self.conversation_history = []
+        self._system_prompt_cache: Dict[str, str] = {}
+        # One event loop for all fan-out calls so the async client's pool stays bound to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the API clients and the manager's event loop"""
+        self.loader.flush_metadata_cache()
+        if self.aclient:
+            self._run(self.aclient.close())
+        if self.client:
+            self.client.close()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._loop = None
+        self._sem = None
 
     def load_agents(self):
-        """Load all agents from profiles"""
-        self.agents = self.loader.load_all_agents()
-        print(f"✅ Loaded {len(self.agents)} agents")
+        """Register all agents from profiles; contents are read on first use"""
+        agents = self.loader.register_all_agents()
+        self._system_prompt_cache.clear()
+        print(f"✅ Registered {len(agents)} agents")
 
     def invoke_agent(self, agent_id: str, task: str, model: str = "claude-opus-4-1") -> str:
         """
@@ -39,29 +80,82 @@ class AgentManager:
         if not self.client:
             raise ValueError("Claude API key not configured. Set ANTHROPIC_API_KEY environment variable.")
 
-        if agent_id not in self.agents:
-            raise ValueError(f"Agent not found: {agent_id}")
+        # Invoke Claude with agent profile as system context
+        response = self.client.messages.create(**self._request_kwargs(agent_id, task, model))
 
-        agent_profile = self.agents[agent_id]
+        return response.content[0].text
 
-        # Create system prompt with agent profile
-        system_prompt = f"""You are an AI agent with the following profile:
+    async def _ainvoke(self, agent_id: str, task: str, model: str = "claude-opus-4-1") -> str:
+        """Async counterpart of invoke_agent used for concurrent fan-out"""
+        if not self.aclient:
+            raise ValueError("Claude API key not configured. Set ANTHROPIC_API_KEY environment variable.")
 
-{agent_profile}
+        request_kwargs = self._request_kwargs(agent_id, task, model)
 
-Follow the instructions and personality defined in your profile. Maintain consistency with your role, expertise, and communication style."""
+        if self._sem is None:
+            # Created here so it belongs to the running event loop
+            self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-        # Invoke Claude with agent profile as system context
-        response = self.client.messages.create(
-            model=model,
-            max_tokens=4096,
-            system=system_prompt,
-            messages=[
+        async with self._sem:
+            response = await self.aclient.messages.create(**request_kwargs)
+
+        return response.content[0].text
+
+    def _request_kwargs(self, agent_id: str, task: str, model: str) -> Dict:
+        """Build the messages.create arguments shared by the sync and async paths"""
+        return {
+            'model': model,
+            'max_tokens': 4096,
+            'system': [{
+                "type": "text",
+                "text": self._system_prompt(agent_id),
+                # The profile prefix is identical across calls, so let the API reuse it
+                "cache_control": {"type": "ephemeral"}
+            }],
+            'messages': [
                 {"role": "user", "content": task}
             ]
+        }
+
+    async def _gather(self, agents: List[str], task: str) -> Dict[str, str]:
+        """Invoke agents concurrently, recording failures as error strings"""
+        results = await asyncio.gather(
+            *[self._ainvoke(agent_id, task) for agent_id in agents],
+            return_exceptions=True
         )
 
-        return response.content[0].text
+        responses = {}
+        for agent_id, result in zip(agents, results):
+            if isinstance(result, BaseException):
+                responses[agent_id] = f"Error: {str(result)}"
+            else:
+                responses[agent_id] = result
+
+        return responses
+
+    def _run(self, coro):
+        """Run a coroutine on the manager's event loop"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def _system_prompt(self, agent_id: str) -> str:
+        """Build the system prompt for an agent from its profile, once per agent"""
+        cached = self._system_prompt_cache.get(agent_id)
+        if cached is not None:
+            return cached
+
+        if not self.loader.has_agent(agent_id):
+            raise ValueError(f"Agent not found: {agent_id}")
+
+        agent_profile = self.loader.get_agent_content(agent_id)
+
+        # Create system prompt with agent profile
+        return self._system_prompt_cache.setdefault(agent_id, f"""You are an AI agent with the following profile:
+
+{agent_profile}
+
+Follow the instructions and personality defined in your profile. Maintain consistency with your role, expertise, and communication style.""")
 
     def invoke_multiple_agents(self, agents: List[str], task: str) -> Dict[str, str]:
         """
@@ -74,15 +168,7 @@ Follow the instructions and personality defined in your profile. Maintain consis
         Returns:
             Dictionary with responses from each agent
         """
-        responses = {}
-        for agent_id in agents:
-            try:
-                response = self.invoke_agent(agent_id, task)
-                responses[agent_id] = response
-            except Exception as e:
-                responses[agent_id] = f"Error: {str(e)}"
-
-        return responses
+        return self._run(self._gather(agents, task))
 
     def get_phase_agents(self, phase: str) -> List[str]:
         """Get agent IDs for a specific phase"""
@@ -91,9 +177,9 @@ Follow the instructions and personality defined in your profile. Maintain consis
 
     def get_agent_profile(self, agent_id: str) -> str:
         """Get the full profile of an agent"""
-        if agent_id not in self.agents:
+        if not self.loader.has_agent(agent_id):
             raise ValueError(f"Agent not found: {agent_id}")
-        return self.agents[agent_id]
+        return self.loader.get_agent_content(agent_id)
 
     def list_agents(self, phase: Optional[str] = None) -> List[Dict]:
         """List all agents or agents for a specific phase"""
@@ -121,13 +207,8 @@ Follow the instructions and personality defined in your profile. Maintain consis
             'supporting_responses': {}
         }
 
-        # Get inputs from supporting agents first
-        for agent_id in supporting_agents:
-            try:
-                response = self.invoke_agent(agent_id, task)
-                results['supporting_responses'][agent_id] = response
-            except Exception as e:
-                results['supporting_responses'][agent_id] = f"Error: {str(e)}"
+        # Get inputs from supporting agents first, all in parallel
+        results['supporting_responses'] = self.invoke_multiple_agents(supporting_agents, task)
 
         # Primary agent sees all supporting input
         supporting_context = "\n\n".join([
@@ -160,7 +241,7 @@ Please provide your response as the primary agent, integrating the supporting in
 
         agent_id = input("\nChoose an agent (e.g., 01_god_mode_v4.1): ").strip()
 
-        if agent_id not in self.agents:
+        if not self.loader.has_agent(agent_id):
             print(f"❌ Agent not found: {agent_id}")
             return
 
@@ -190,22 +271,22 @@ def main():
     import sys
 
     # Initialize manager
-    manager = AgentManager()
-    manager.load_agents()
+    with AgentManager() as manager:
+        manager.load_agents()
 
-    if len(sys.argv) < 2:
-        # Start interactive conversation
-        manager.start_conversation()
-    else:
-        # Command line invocation
-        agent_id = sys.argv[1]
-        task = " ".join(sys.argv[2:]) if len(sys.argv) > 2 else "Hello"
+        if len(sys.argv) < 2:
+            # Start interactive conversation
+            manager.start_conversation()
+        else:
+            # Command line invocation
+            agent_id = sys.argv[1]
+            task = " ".join(sys.argv[2:]) if len(sys.argv) > 2 else "Hello"
 
-        try:
-            response = manager.invoke_agent(agent_id, task)
-            print(f"\n{agent_id} Response:\n{response}")
-        except Exception as e:
-            print(f"Error: {str(e)}")
+            try:
+                response = manager.invoke_agent(agent_id, task)
+                print(f"\n{agent_id} Response:\n{response}")
+            except Exception as e:
+                print(f"Error: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -3,31 +3,33 @@ Inter-Agent Communication Protocol Handler
 Standardized communication between agents
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
+from collections import defaultdict
 from enum import Enum
-import json
+from serialization import dumps, dump_file
 
 
 class Priority(Enum):
     """Priority levels for agent requests"""
-    CRITICAL = "Critical"
-    HIGH = "High"
-    MEDIUM = "Medium"
-    LOW = "Low"
+    CRITICAL = sys.intern("Critical")
+    HIGH = sys.intern("High")
+    MEDIUM = sys.intern("Medium")
+    LOW = sys.intern("Low")
 
 
 class Status(Enum):
     """Status of agent requests/responses"""
-    ACCEPTED = "Accepted"
-    REJECTED = "Rejected"
-    IN_PROGRESS = "In Progress"
-    COMPLETED = "Completed"
-    BLOCKED = "Blocked"
+    ACCEPTED = sys.intern("Accepted")
+    REJECTED = sys.intern("Rejected")
+    IN_PROGRESS = sys.intern("In Progress")
+    COMPLETED = sys.intern("Completed")
+    BLOCKED = sys.intern("Blocked")
 
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class AgentRequest:
     """Standardized request format between agents"""
     from_agent: str
@@ -37,22 +39,33 @@ class AgentRequest:
     request: str
     deliverable: str
     timeline: str
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Rendered markdown, filled in on first to_markdown() call; deliberately
+    # unannotated so it is a plain class attribute, not a dataclass field
+    _markdown = None
 
     def to_markdown(self) -> str:
         """Export request as markdown"""
-        return f"""=== AGENT REQUEST ===
-FROM: {self.from_agent}
-TO: {self.to_agent}
-PRIORITY: {self.priority.value}
-CONTEXT: {self.context}
-REQUEST: {self.request}
-DELIVERABLE: {self.deliverable}
-TIMELINE: {self.timeline}
-=== END REQUEST ==="""
-
-    def to_json(self) -> str:
-        """Export request as JSON"""
-        return json.dumps({
+        if self._markdown is None:
+            object.__setattr__(self, '_markdown', self._render_markdown())
+        return self._markdown
+
+    def _render_markdown(self) -> str:
+        return '\n'.join([
+            "=== AGENT REQUEST ===",
+            f"FROM: {self.from_agent}",
+            f"TO: {self.to_agent}",
+            f"PRIORITY: {self.priority.value}",
+            f"CONTEXT: {self.context}",
+            f"REQUEST: {self.request}",
+            f"DELIVERABLE: {self.deliverable}",
+            f"TIMELINE: {self.timeline}",
+            "=== END REQUEST ==="
+        ])
+
+    def _as_dict(self) -> dict:
+        """Export request as a JSON-ready dict"""
+        return {
             'from_agent': self.from_agent,
             'to_agent': self.to_agent,
             'priority': self.priority.value,
@@ -60,11 +73,15 @@ TIMELINE: {self.timeline}
             'request': self.request,
             'deliverable': self.deliverable,
             'timeline': self.timeline,
-            'created_at': datetime.now().isoformat()
-        }, indent=2)
+            'created_at': self.created_at
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export request as JSON"""
+        return dumps(self._as_dict(), indent=indent)
 
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class AgentResponse:
     """Standardized response format between agents"""
     from_agent: str
@@ -73,35 +90,50 @@ class AgentResponse:
     estimated_completion: str
     questions: Optional[str] = None
     notes: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Rendered markdown, filled in on first to_markdown() call; deliberately
+    # unannotated so it is a plain class attribute, not a dataclass field
+    _markdown = None
 
     def to_markdown(self) -> str:
         """Export response as markdown"""
-        md = f"""=== AGENT RESPONSE ===
-FROM: {self.from_agent}
-TO: {self.to_agent}
-STATUS: {self.status.value}
-ESTIMATED_COMPLETION: {self.estimated_completion}"""
+        if self._markdown is None:
+            object.__setattr__(self, '_markdown', self._render_markdown())
+        return self._markdown
+
+    def _render_markdown(self) -> str:
+        parts = [
+            "=== AGENT RESPONSE ===",
+            f"FROM: {self.from_agent}",
+            f"TO: {self.to_agent}",
+            f"STATUS: {self.status.value}",
+            f"ESTIMATED_COMPLETION: {self.estimated_completion}"
+        ]
 
         if self.questions:
-            md += f"\nQUESTIONS: {self.questions}"
+            parts.append(f"QUESTIONS: {self.questions}")
 
         if self.notes:
-            md += f"\nNOTES: {self.notes}"
+            parts.append(f"NOTES: {self.notes}")
 
-        md += "\n=== END RESPONSE ==="
-        return md
+        parts.append("=== END RESPONSE ===")
+        return '\n'.join(parts)
 
-    def to_json(self) -> str:
-        """Export response as JSON"""
-        return json.dumps({
+    def _as_dict(self) -> dict:
+        """Export response as a JSON-ready dict"""
+        return {
             'from_agent': self.from_agent,
             'to_agent': self.to_agent,
             'status': self.status.value,
             'estimated_completion': self.estimated_completion,
             'questions': self.questions,
             'notes': self.notes,
-            'created_at': datetime.now().isoformat()
-        }, indent=2)
+            'created_at': self.created_at
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export response as JSON"""
+        return dumps(self._as_dict(), indent=indent)
 
 
 class CommunicationHandler:
@@ -110,6 +142,9 @@ class CommunicationHandler:
     def __init__(self):
         self.requests: List[AgentRequest] = []
         self.responses: List[AgentResponse] = []
+        # Requests indexed by recipient and by sender
+        self._by_to: Dict[str, List[AgentRequest]] = defaultdict(list)
+        self._by_from: Dict[str, List[AgentRequest]] = defaultdict(list)
 
     def create_request(
         self,
@@ -132,6 +167,8 @@ class CommunicationHandler:
             timeline=timeline
         )
         self.requests.append(req)
+        self._by_to[to_agent].append(req)
+        self._by_from[from_agent].append(req)
         return req
 
     def create_response(
@@ -157,22 +194,21 @@ class CommunicationHandler:
 
     def get_requests_for_agent(self, agent_id: str) -> List[AgentRequest]:
         """Get all pending requests for an agent"""
-        return [req for req in self.requests if req.to_agent == agent_id]
+        return list(self._by_to.get(agent_id, []))
 
     def get_requests_from_agent(self, agent_id: str) -> List[AgentRequest]:
         """Get all requests sent by an agent"""
-        return [req for req in self.requests if req.from_agent == agent_id]
+        return list(self._by_from.get(agent_id, []))
 
-    def export_communication_log(self, filepath: str = "communication_log.json"):
-        """Export all communications"""
+    def export_communication_log(self, filepath: str = "communication_log.json", indent: Optional[int] = None):
+        """Export all communications (compact unless an indent is given)"""
         log = {
-            'requests': [json.loads(req.to_json()) for req in self.requests],
-            'responses': [json.loads(resp.to_json()) for resp in self.responses],
+            'requests': [req._as_dict() for req in self.requests],
+            'responses': [resp._as_dict() for resp in self.responses],
             'exported_at': datetime.now().isoformat()
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(log, f, indent=2)
+        dump_file(log, filepath, indent=indent)
 
         print(f"Communication log exported to {filepath}")
 
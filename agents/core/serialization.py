@@ -0,0 +1,41 @@
+"""
+Serialization - JSON encoding for agent exports and messages
+Uses orjson when installed, falling back to the standard library
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_option(indent: Optional[int]) -> int:
+    # orjson only supports two-space indentation
+    return orjson.OPT_INDENT_2 if indent is not None else 0
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Serialize an object to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_orjson_option(indent)).decode('utf-8')
+    return json.dumps(obj, indent=indent)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a JSON string or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(obj: Any, filepath: str, indent: Optional[int] = None):
+    """Serialize an object as JSON into a file"""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(obj, option=_orjson_option(indent)))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=indent)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 workflows_dir = '.github/workflows'
 os.makedirs(workflows_dir, exist_ok=True)
@@ -183,10 +184,22 @@ jobs:
 """
 }
 
+messages = []
+written = skipped = 0
 for filename, content in workflows.items():
-    filepath = os.path.join(workflows_dir, filename)
-    with open(filepath, 'w') as f:
-        f.write(content)
-    print(f'✅ Created {filename}')
-
-print('\n🎉 All workflows created successfully!')
+    filepath = Path(workflows_dir) / filename
+    # Leave unchanged files alone so their mtimes don't churn
+    try:
+        if filepath.read_text(encoding='utf-8') == content:
+            messages.append(f'⏭️  Unchanged {filename}')
+            skipped += 1
+            continue
+    except (FileNotFoundError, UnicodeDecodeError):
+        # Missing or unreadable files are simply (re)written
+        pass
+    filepath.write_text(content, encoding='utf-8')
+    messages.append(f'✅ Created {filename}')
+    written += 1
+
+print('\n'.join(messages))
+print(f'\n🎉 Workflows up to date: {written} written, {skipped} unchanged')